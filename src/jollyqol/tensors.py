@@ -1,10 +1,245 @@
 """Some quality-of-life improvements."""
 import functools
 import sys
-import inspect
+import weakref
+from array import array
 
 #typing
-from typing import Dict, Set, Tuple, assert_never
+from typing import Dict, NamedTuple, Set, Tuple
+
+_FAILED = object()
+"""Sentinel returned by the fast checker when a shape check fails."""
+
+# Code-object flags (inspect.CO_VARARGS / CO_VARKEYWORDS, without the import)
+_CO_VARARGS = 0x04
+_CO_VARKEYWORDS = 0x08
+
+_SIG_CACHE = weakref.WeakKeyDictionary()
+"""
+Per-function introspection cache. Weak keys, so decorating a function never
+pins it (or its closure and default tensors) for the life of the process -
+factories that create and drop functions repeatedly would otherwise leak
+every instance through the cache.
+"""
+
+def _sig(func):
+    """
+    Memoized argument introspection: returns (Signature | None, name ->
+    positional index map, defaults map) for `func`. Plain Python functions
+    (no *args/**kwargs) are read straight off __code__ and never touch
+    `inspect`; the Signature is only built for callables that need a full
+    bind fallback, and `inspect` is imported lazily so simply importing this
+    module stays cheap.
+    """
+    try:
+        cached = _SIG_CACHE.get(func)
+    except TypeError:
+        cached = None  # not weak-referenceable: compute without caching
+    if cached is not None:
+        return cached
+
+    code = getattr(func, "__code__", None)
+    if code is not None and not code.co_flags & (_CO_VARARGS | _CO_VARKEYWORDS):
+        argnames = code.co_varnames[:code.co_argcount + code.co_kwonlyargcount]
+        defaults = {}
+        if func.__defaults__:
+            # __defaults__ aligns with the tail of the positional parameters
+            first_defaulted = code.co_argcount - len(func.__defaults__)
+            defaults.update(zip(argnames[first_defaulted:code.co_argcount], func.__defaults__))
+        if func.__kwdefaults__:
+            defaults.update(func.__kwdefaults__)
+        result = (None, {name: index for index, name in enumerate(argnames)}, defaults)
+    else:
+        import inspect
+        signature = inspect.signature(func)
+        # Only parameters in a fixed positional slot (positional-only or
+        # positional-or-keyword, which always precede *args) can be fetched as
+        # args[index]; *args itself, keyword-only params and **kwargs get -1 so
+        # lookups go through kwargs or a full bind instead.
+        positions = {}
+        for index, parameter in enumerate(signature.parameters.values()):
+            if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD):
+                positions[parameter.name] = index
+            else:
+                positions[parameter.name] = -1
+        result = (signature, positions, {})
+
+    try:
+        _SIG_CACHE[func] = result
+    except TypeError:
+        pass  # not weak-referenceable: skip caching
+    return result
+
+class ShapeMismatchError(ValueError):
+    """
+    Raised by @sizes when a Tensor argument does not match its expected shape.
+    Subclasses ValueError so existing `except ValueError` handlers still work.
+    """
+
+_LABEL_POOL: Dict[str, str] = {}
+"""
+Process-wide pool of wildcard labels. Interned strings can be collected once
+unreferenced, so the pool pins one str object per label for the process
+lifetime and every spec across every decoration shares it (pointer-equal dict
+keys, shared hash).
+"""
+
+def _pooled_label(label: str) -> str:
+    """Return the pooled (interned) instance of a wildcard label."""
+    interned = sys.intern(label)
+    return _LABEL_POOL.setdefault(interned, interned)
+
+ENABLED = True
+"""
+Runtime switch for @sizes checking. Set `jollyqol.tensors.ENABLED = False` to
+skip all shape checks without restarting under `python -O` (under `-O` the
+decorator compiles away entirely, like `assert`).
+"""
+
+class _Spec(NamedTuple):
+    """
+    Per-tensor check record, frozen at decoration time by _compile_shape.
+    `required_len` is an exact length without an ellipsis and a minimum length
+    with one; `prefix`/`suffix` are the dims around the ellipsis (for a plain
+    shape, prefix is the whole shape and suffix is empty).
+    """
+    name: str
+    param_index: int
+    expected: Tuple[int|str|type(...), ...]
+    has_ellipsis: bool
+    required_len: int
+    prefix: Tuple[int|str, ...]
+    suffix: Tuple[int|str, ...]
+    exact_indices: array  # parallel int64 arrays: unboxed (index, required dim)
+    exact_values: array
+    wildcard_checks: Tuple[Tuple[int,str], ...]
+    all_exact: bool  # no ellipsis and no wildcards: shape == expected suffices
+
+def _compile_shape(expected):
+    """
+    Flatten an expected shape into precomputed check lists, once, at
+    decoration time. Suffix dimensions (after an ellipsis) are addressed with
+    negative indices so the checker never has to slice or scan `expected`.
+    Returns the _Spec fields after `expected` (everything but name and index).
+    """
+    ellipsis_count = sum(1 for x in expected if x is ...)
+    if ellipsis_count > 1:
+        raise ValueError(
+            "@sizes: Only one ellipsis allowed per shape specification."
+        )
+    has_ellipsis = ellipsis_count == 1
+
+    if has_ellipsis:
+        ellipsis_index = expected.index(...)
+        prefix = expected[:ellipsis_index]
+        suffix = expected[ellipsis_index+1:]
+        indexed_dims = list(enumerate(prefix))
+        indexed_dims += [(i - len(suffix), edim) for i, edim in enumerate(suffix)]
+        required_len = len(prefix) + len(suffix)
+    else:
+        prefix = expected
+        suffix = ()
+        indexed_dims = list(enumerate(expected))
+        required_len = len(expected)
+
+    exact_indices = []
+    exact_values = []
+    wildcard_checks = []
+    for index, edim in indexed_dims:
+        # `type(x) is` dispatch is cheaper than match/case's __instancecheck__
+        edim_type = type(edim)
+        if edim_type is int:
+            exact_indices.append(index)
+            exact_values.append(edim)
+        elif edim_type is str:
+            wildcard_checks.append((index, edim))
+        else:
+            # Rejecting bad entries here (once, eagerly) means the runtime
+            # loops only ever see ints and strs and need no impossible-case arm.
+            raise TypeError(
+                f"@sizes: Expected shape entries must be int, str, or ..., got {edim!r}."
+            )
+
+    # The int pairs live in parallel array('q')s: one machine word per entry
+    # instead of a boxed PyLong inside a tuple inside a tuple.
+    return (has_ellipsis, required_len, prefix, suffix,
+            array('q', exact_indices), array('q', exact_values),
+            tuple(wildcard_checks),
+            not has_ellipsis and not wildcard_checks)
+
+def _compile_wrapper_source(argnames, defaulted, checks):
+    """
+    Emit the source of a specialized wrapper for a plain positional function:
+    all checks from the specs collapse into a single flat boolean guard
+    expression (chained `and`s of length gates and dim comparisons, with
+    wildcards resolved to equalities against their first occurrence), so one
+    `if not (...)` evaluates the whole contract with no loops and no
+    args/kwargs unpacking. `_func`, `_fail` and any `_default_<name>` objects
+    are injected as hidden keyword-only defaults; `ENABLED` resolves live
+    through the module globals.
+    """
+    params = [
+        f"{name}=_default_{name}" if name in defaulted else name
+        for name in argnames
+    ]
+    params += ["*", "_func=_func", "_fail=_fail"]
+    call_args = ", ".join(argnames)
+    lines = [
+        f"def sizes_wrapper({', '.join(params)}):",
+        "    if not ENABLED:",
+        f"        return _func({call_args})",
+        "    __tracebackhide__ = True",
+        "    try:",
+    ]
+    conditions = []
+    wildcard_exprs: Dict[str, str] = {}
+    for tensor_index, spec in enumerate(checks):
+        shape_var = f"_s{tensor_index}"
+        lines.append(f"        {shape_var} = {spec.name}.shape")
+        if spec.all_exact:
+            # All-int spec: a single C-level tuple comparison covers the
+            # length and every dim at once.
+            conditions.append(f"{shape_var} == {spec.expected!r}")
+            continue
+        if not spec.has_ellipsis:
+            conditions.append(f"len({shape_var}) == {spec.required_len}")
+        elif spec.required_len > 0:
+            conditions.append(f"len({shape_var}) >= {spec.required_len}")
+        for index, exact_dim in zip(spec.exact_indices, spec.exact_values):
+            conditions.append(f"{shape_var}[{index}] == {exact_dim}")
+        for index, wildcard_label in spec.wildcard_checks:
+            dim_expr = f"{shape_var}[{index}]"
+            first_expr = wildcard_exprs.get(wildcard_label)
+            if first_expr is None:
+                wildcard_exprs[wildcard_label] = dim_expr
+            else:
+                conditions.append(f"{dim_expr} == {first_expr}")
+    if conditions:
+        lines.append(f"        if not ({' and '.join(conditions)}):")
+        lines.append(f"            _fail({call_args})")
+    lines.append("    except AttributeError:")
+    lines.append("        # a non-tensor argument: _fail rebuilds the nice error")
+    lines.append(f"        _fail({call_args})")
+    lines.append(f"    return _func({call_args})")
+    return "\n".join(lines)
+
+@functools.lru_cache(maxsize=None)
+def _specialized_code(argnames, defaulted, spec_key):
+    """
+    Compile the specialized wrapper once per distinct shape contract. Keyed by
+    the parameter names, the defaulted-parameter names, and the
+    position-normalized (index, expected shape) pairs, so factories that
+    re-create identically-shaped functions share a single code object and only
+    rebind `_func`/defaults at exec time. (Sharing across *differently named*
+    parameters is off the table: the generated wrapper keeps the real names so
+    keyword calls keep working.)
+    """
+    checks = tuple(
+        _Spec(argnames[param_index], param_index, expected, *_compile_shape(expected))
+        for param_index, expected in spec_key
+    )
+    source = _compile_wrapper_source(argnames, defaulted, checks)
+    return compile(source, "<@sizes>", "exec")
 
 #--------------------------------------------------------------------------------------------------#
 #   This code is an augmented version of my implementation of @sizes to handle the ellipse (...)   #
@@ -20,211 +255,320 @@ def sizes(**expected_shapes: Tuple[[int|str|type(...)], ...]):
       @sizes(y=(2, ..., 'N', 5))  means shape must start with 2, end with 5,
         and have any number of dims in-between (which can match 'N' if that dimension is named).
     """
-    def sizes_decorator(tensor_func):
-        actual_func_sig = inspect.signature(tensor_func)
-
-        @functools.wraps(tensor_func)
-        def sizes_wrapper(*args, **kwargs):
-            try:
-                actual_func_bindings = actual_func_sig.bind(*args, **kwargs)
-                actual_func_bindings.apply_defaults()
-
-                # Maps the tensor name -> (expected, actual) shapes
-                collected_tensors : Dict[str, Tuple[Tuple[int|str|type(...)],...], Tuple[int,...]] = {}
-
-                for expected_tensor_name, expected_shape in expected_shapes.items():
-                    # Ensure the tensor belongs to the function signature
-                    if expected_tensor_name not in actual_func_sig.parameters:
-                        raise ValueError(
-                            f"@sizes: Function is missing Tensor argument {expected_tensor_name}."
-                        )
+    # Intern wildcard labels once so the per-call dict lookups keyed on them
+    # hit CPython's pointer-equality fast path (labels built at runtime via
+    # str(...) would otherwise not be interned).
+    expected_shapes = {
+        name: tuple(
+            _pooled_label(edim) if type(edim) is str else edim
+            for edim in expected_shape
+        )
+        for name, expected_shape in expected_shapes.items()
+    }
 
-                    # Ensure the argument is tensor-like
+    def sizes_decorator(tensor_func):
+        # Under `python -O` the checks compile away entirely, like `assert`:
+        # the decorated function is returned unwrapped at zero call overhead.
+        if not __debug__:
+            return tensor_func
+
+        # @sizes() with no specs has nothing to check: don't wrap at all
+        # (the codegen path would otherwise emit an empty try body).
+        if not expected_shapes:
+            return tensor_func
+
+        actual_func_sig, param_positions, param_defaults = _sig(tensor_func)
+
+        # Validate parameter names once at decoration time (not per-call) and
+        # remember each tensor's positional index so the wrapper can fetch it
+        # straight out of args/kwargs without re-binding the signature.
+        for expected_tensor_name in expected_shapes:
+            if expected_tensor_name not in param_positions:
+                raise ValueError(
+                    f"@sizes: Function is missing Tensor argument {expected_tensor_name}."
+                )
+        checks = tuple(
+            _Spec(name, param_positions[name], expected_shape, *_compile_shape(expected_shape))
+            for name, expected_shape in expected_shapes.items()
+        )
+
+        def _check_fast(args, kwargs):
+            """
+            Success-only pass: runs the precompiled index/compare lists from
+            _compile_shape (no match/case, no tuple slicing, no generator
+            expressions), unifies wildcards with a first-seen dict, and bails
+            with _FAILED on the first mismatch; returns None when every shape
+            passes. (A signature bind happens only for defaulted arguments and
+            is used purely for the lookup, never for re-packing the call.)
+            """
+            __tracebackhide__ = True  # hide this frame in pytest reports
+            actual_func_bindings = None
+            wildcards: Dict[str, int] = {}
+            for (expected_tensor_name, param_index, expected, has_ellipsis, required_len,
+                 _, _, exact_indices, exact_values, wildcard_checks, all_exact) in checks:
+                # Fetch the tensor directly by position/name; only fall back
+                # to a full signature bind if it came in via a default.
+                if 0 <= param_index < len(args):
+                    maybe_tensor = args[param_index]
+                elif expected_tensor_name in kwargs:
+                    maybe_tensor = kwargs[expected_tensor_name]
+                elif actual_func_sig is not None:
+                    # *args/**kwargs function: fall back to a full bind
+                    if actual_func_bindings is None:
+                        actual_func_bindings = actual_func_sig.bind(*args, **kwargs)
+                        actual_func_bindings.apply_defaults()
                     maybe_tensor = actual_func_bindings.arguments[expected_tensor_name]
-                    if not hasattr(maybe_tensor, "shape"):
-                        raise ValueError(
-                            f"@sizes: Expected tensor-like object, but {expected_tensor_name} has no shape attribute."
-                        )
-                    actual_tensor = maybe_tensor
-
-                    # Build (expected, actual) shape pair
-                    actual_shape = tuple(actual_tensor.shape)
-                    collected_tensors[expected_tensor_name] = (expected_shape, actual_shape)
-
-                # We will collect dimension constraints in two passes:
-                #    1) Check if the prefix/suffix dimension counts match
-                #    2) Collect wildcard constraints and see if they unify
-                exacts_good = True
-                wildcards: Dict[str, Set[int]] = {}
-
-                # A small helper to unify a single dimension (one expected, one actual).
-                def unify_dim(edim, adim):
-                    nonlocal exacts_good
-                    match edim:
-                        case int(exact_dim):
-                            if exact_dim != adim:
-                                exacts_good = False
-                        case str(wildcard_label):
-                            wildcards.setdefault(wildcard_label, set()).add(adim)
-                        case _ as impossible:
-                            assert_never(impossible)
-
-                # We track which tensors are dimension-mismatched for a nice error message later
-                shape_mismatch_tensor_names = set()
-
-                for tname, (expected, actual) in collected_tensors.items():
-                    # Check if there is an ellipsis in the shape
-                    try:
-                        if ... not in expected:
-                            if len(expected) != len(actual):
-                                shape_mismatch_tensor_names.add(tname)
-                                continue
-                            # Unify dimension by dimension
-                            for (edim, adim) in zip(expected, actual):
-                                unify_dim(edim, adim)
-                        else:
-                            # We allow exactly one ellipsis
-                            if sum(1 for x in expected if x is ...) > 1:
-                                raise ValueError(
-                                    "@sizes: Only one ellipsis allowed per shape specification."
-                                )
-                            # Split the shape on the ellipsis
-                            ellipsis_index = expected.index(...)
-                            prefix = expected[:ellipsis_index]
-                            suffix = expected[ellipsis_index+1:]
-
-                            # We must have at least prefix+suffix length <= actual length
-                            if len(prefix) + len(suffix) > len(actual):
-                                shape_mismatch_tensor_names.add(tname)
-                                continue
-
-                            # Unify prefix
-                            for (edim, adim) in zip(prefix, actual[:len(prefix)]):
-                                unify_dim(edim, adim)
-
-                            # The middle is unconstrained, so skip
-
-                            # Unify suffix
-                            # e.g. if suffix = (4, 'N'), and prefix = (3,), then
-                            # actual[:len(prefix)] = actual[:1], actual[-len(suffix):] = actual[-2:]
-                            if len(suffix) > 0:
-                                for (edim, adim) in zip(
-                                    suffix[::-1],
-                                    actual[len(actual)-len(suffix):][::-1],
-                                ):
-                                    unify_dim(edim, adim)
-
-                    except ValueError as e:
-                        raise e  # Reraise for clarity
-
-                # Now check that all wildcards are consistent (each name must unify to exactly one set dimension)
-                inconsistent_wildcards = {key for key, value in wildcards.items() if len(value) != 1}
-
-                if not exacts_good or shape_mismatch_tensor_names or inconsistent_wildcards:
-                    # Build a message for debugging
-                    tensor_strings = []
-                    for tensor_name, (expected, actual) in collected_tensors.items():
-                        prefix_str = f"{tensor_name}: ("
-                        parts = []
-                        # We'll do a second pass, but highlighting mistakes
-                        #   so we parse again. This is purely for a nicer error message:
-                        if ... not in expected:
-                            # exact match
-                            for (edim, adim) in zip(expected, actual) if len(expected)==len(actual) else []:
-                                match edim:
-                                    case int(exact_dim):
-                                        if exact_dim != adim:
-                                            parts.append(f"{exact_dim}\033[0;31m={adim}\033[0m")
-                                        else:
-                                            parts.append(str(adim))
-                                    case str(wildcard_label):
-                                        # Check if inconsistent
-                                        if wildcard_label in inconsistent_wildcards:
-                                            parts.append(f"{wildcard_label}\033[0;31m={adim}\033[0m")
-                                        else:
-                                            parts.append(f"{wildcard_label}")
-                                    case _:
-                                        parts.append(f"{edim}?")
-                            # If length mismatch, we highlight all
-                            if len(expected) != len(actual):
-                                mismatch_str = f"Expected {len(expected)} dims, got {len(actual)} dims."
-                                parts = [mismatch_str]
-                        else:
-                            # has ellipsis
-                            # prefix + suffix
-                            ellipsis_index = expected.index(...)
-                            prefix = expected[:ellipsis_index]
-                            suffix = expected[ellipsis_index+1:]
-                            # highlight prefix
-                            for (edim, adim) in zip(prefix, actual[:len(prefix)]):
-                                match edim:
-                                    case int(exact_dim):
-                                        if exact_dim != adim:
-                                            parts.append(f"{exact_dim}\033[0;31m={adim}\033[0m")
-                                        else:
-                                            parts.append(str(adim))
-                                    case str(wildcard_label):
-                                        if wildcard_label in inconsistent_wildcards:
-                                            parts.append(f"{wildcard_label}\033[0;31m={adim}\033[0m")
-                                        else:
-                                            parts.append(f"{wildcard_label}")
-                                    case _:
-                                        parts.append(f"{edim}?")
-
-                            parts.append("...")  # literal ellipsis in error message
-
-                            if len(prefix) + len(suffix) > len(actual):
-                                # mismatch, can't unify suffix
-                                parts.append(f"\033[0;31m(Suffix mismatch?)\033[0m")
-                            else:
-                                # highlight suffix
-                                tail_actual = actual[len(actual)-len(suffix):]
-                                for (edim, adim) in zip(suffix, tail_actual):
-                                    match edim:
-                                        case int(exact_dim):
-                                            if exact_dim != adim:
-                                                parts.append(f"{exact_dim}\033[0;31m={adim}\033[0m")
-                                            else:
-                                                parts.append(str(adim))
-                                        case str(wildcard_label):
-                                            if wildcard_label in inconsistent_wildcards:
-                                                parts.append(f"{wildcard_label}\033[0;31m={adim}\033[0m")
-                                            else:
-                                                parts.append(f"{wildcard_label}")
-                                        case _:
-                                            parts.append(f"{edim}?")
-
-                        tensor_strings.append(prefix_str + ",".join(parts) + ")")
-
-                    error_msg = []
-                    if shape_mismatch_tensor_names:
-                        error_msg.append(
-                            "Tensor(s) had different # of dims than expected: "
-                            + ", ".join(shape_mismatch_tensor_names)
-                        )
-                    if inconsistent_wildcards:
-                        error_msg.append(
-                            "Inconsistent wildcard(s): " + ", ".join(inconsistent_wildcards)
-                        )
-                    if not exacts_good:
-                        error_msg.append("Static dims do not match.")
-
-                    final_error_msg = (
-                        "@sizes: " + "; ".join(error_msg) + "\n  " + "\n  ".join(tensor_strings)
+                elif expected_tensor_name in param_defaults:
+                    maybe_tensor = param_defaults[expected_tensor_name]
+                else:
+                    # Genuinely missing: let the call raise its own TypeError.
+                    continue
+
+                # Ensure the argument is tensor-like
+                if not hasattr(maybe_tensor, "shape"):
+                    raise ShapeMismatchError(
+                        f"@sizes: Expected tensor-like object, but {expected_tensor_name} has no shape attribute."
+                    )
+                # .shape is already tuple-like (torch.Size subclasses tuple),
+                # so indexing it directly avoids a tuple allocation per call;
+                # the cold error path is the only place that materializes it.
+                actual = maybe_tensor.shape
+
+                if all_exact:
+                    # One C-level tuple compare (torch.Size == tuple) replaces
+                    # the length gate and the per-dim loop. The second compare
+                    # only runs on a miss, for shapes that are tuple-like but
+                    # not tuple subclasses (e.g. a list).
+                    if actual != expected and tuple(actual) != expected:
+                        return _FAILED
+                    continue
+
+                # Length gate: exact without an ellipsis, minimum with one.
+                if has_ellipsis:
+                    if len(actual) < required_len:
+                        return _FAILED
+                elif len(actual) != required_len:
+                    return _FAILED
+
+                for index, exact_dim in zip(exact_indices, exact_values):
+                    if actual[index] != exact_dim:
+                        return _FAILED
+
+                for index, wildcard_label in wildcard_checks:
+                    adim = actual[index]
+                    # First-seen dim wins; later occurrences must agree.
+                    seen = wildcards.get(wildcard_label, _FAILED)
+                    if seen is _FAILED:
+                        wildcards[wildcard_label] = adim
+                    elif seen != adim:
+                        return _FAILED
+
+            return None
+
+        def _build_error(args, kwargs):
+            """
+            Cold path: re-resolves every tensor and rebuilds the full colored
+            diagnostic. Runs at most once per failing call, so it can afford
+            the dict/set machinery the fast path avoids.
+            """
+            __tracebackhide__ = True  # hide this frame in pytest reports
+            # Maps the tensor name -> (spec, actual shape)
+            collected_tensors : Dict[str, Tuple[_Spec, Tuple[int,...]]] = {}
+
+            actual_func_bindings = None
+            for spec in checks:
+                if 0 <= spec.param_index < len(args):
+                    actual_tensor = args[spec.param_index]
+                elif spec.name in kwargs:
+                    actual_tensor = kwargs[spec.name]
+                elif actual_func_sig is not None:
+                    # *args/**kwargs function: fall back to a full bind
+                    if actual_func_bindings is None:
+                        actual_func_bindings = actual_func_sig.bind(*args, **kwargs)
+                        actual_func_bindings.apply_defaults()
+                    actual_tensor = actual_func_bindings.arguments[spec.name]
+                elif spec.name in param_defaults:
+                    actual_tensor = param_defaults[spec.name]
+                else:
+                    # Genuinely missing: the call will raise its own TypeError.
+                    continue
+
+                # Ensure the argument is tensor-like: the fast checker may
+                # have bailed on an earlier tensor before reaching this one.
+                if not hasattr(actual_tensor, "shape"):
+                    raise ShapeMismatchError(
+                        f"@sizes: Expected tensor-like object, but {spec.name} has no shape attribute."
                     )
-                    raise ValueError(final_error_msg)
 
-                return tensor_func(*actual_func_bindings.args, **actual_func_bindings.kwargs)
+                # Build (spec, actual shape) pair
+                collected_tensors[spec.name] = (spec, tuple(actual_tensor.shape))
+
+            # We will collect dimension constraints in two passes:
+            #    1) Check if the prefix/suffix dimension counts match
+            #    2) Collect wildcard constraints and see if they unify
+            exacts_good = True
+            wildcards: Dict[str, int] = {}
+            inconsistent_wildcards: Set[str] = set()
+
+            # A small helper to unify a single dimension (one expected, one actual).
+            def unify_dim(edim, adim):
+                nonlocal exacts_good
+                # Specs are type-checked at decoration time: int or str only.
+                if type(edim) is int:
+                    if edim != adim:
+                        exacts_good = False
+                else:
+                    # First-seen dim wins; any later disagreement marks the label.
+                    first = wildcards.get(edim, _FAILED)
+                    if first is _FAILED:
+                        wildcards[edim] = adim
+                    elif first != adim:
+                        inconsistent_wildcards.add(edim)
+
+            # We track which tensors are dimension-mismatched for a nice error message later
+            shape_mismatch_tensor_names = set()
+
+            for tname, (spec, actual) in collected_tensors.items():
+                # The ellipsis split was precomputed on the spec
+                if not spec.has_ellipsis:
+                    if spec.required_len != len(actual):
+                        shape_mismatch_tensor_names.add(tname)
+                        continue
+                    # Unify dimension by dimension
+                    for (edim, adim) in zip(spec.expected, actual):
+                        unify_dim(edim, adim)
+                else:
+                    # We must have at least prefix+suffix length <= actual length
+                    if spec.required_len > len(actual):
+                        shape_mismatch_tensor_names.add(tname)
+                        continue
+
+                    # Unify prefix
+                    for (edim, adim) in zip(spec.prefix, actual):
+                        unify_dim(edim, adim)
+
+                    # The middle is unconstrained, so skip
+
+                    # Unify suffix (paired from the back)
+                    if spec.suffix:
+                        for (edim, adim) in zip(spec.suffix[::-1], actual[::-1]):
+                            unify_dim(edim, adim)
+
+            # Render a single expected/actual dim pair, highlighting mistakes.
+            def format_dim(edim, adim):
+                # Specs are type-checked at decoration time: int or str only.
+                if type(edim) is int:
+                    if edim != adim:
+                        return f"{edim}\033[0;31m={adim}\033[0m"
+                    return str(adim)
+                # Check if inconsistent
+                if edim in inconsistent_wildcards:
+                    return f"{edim}\033[0;31m={adim}\033[0m"
+                return f"{edim}"
+
+            # Build a message for debugging
+            tensor_strings = []
+            for tensor_name, (spec, actual) in collected_tensors.items():
+                prefix_str = f"{tensor_name}: ("
+                parts = []
+                # We'll do a second pass, but highlighting mistakes
+                #   so we parse again. This is purely for a nicer error message:
+                if not spec.has_ellipsis:
+                    # exact match
+                    if spec.required_len == len(actual):
+                        for (edim, adim) in zip(spec.expected, actual):
+                            parts.append(format_dim(edim, adim))
+                    else:
+                        # If length mismatch, we highlight all
+                        parts = [f"Expected {spec.required_len} dims, got {len(actual)} dims."]
+                else:
+                    n_suffix = len(spec.suffix)
+                    # highlight prefix
+                    for (edim, adim) in zip(spec.prefix, actual):
+                        parts.append(format_dim(edim, adim))
+
+                    parts.append("...")  # literal ellipsis in error message
+
+                    if spec.required_len > len(actual):
+                        # mismatch, can't unify suffix
+                        parts.append(f"\033[0;31m(Suffix mismatch?)\033[0m")
+                    else:
+                        # highlight suffix
+                        tail_actual = actual[len(actual)-n_suffix:]
+                        for (edim, adim) in zip(spec.suffix, tail_actual):
+                            parts.append(format_dim(edim, adim))
+
+                tensor_strings.append(prefix_str + ",".join(parts) + ")")
+
+            error_msg = []
+            if shape_mismatch_tensor_names:
+                error_msg.append(
+                    "Tensor(s) had different # of dims than expected: "
+                    + ", ".join(shape_mismatch_tensor_names)
+                )
+            if inconsistent_wildcards:
+                error_msg.append(
+                    "Inconsistent wildcard(s): " + ", ".join(inconsistent_wildcards)
+                )
+            if not exacts_good:
+                error_msg.append("Static dims do not match.")
+
+            return (
+                "@sizes: " + "; ".join(error_msg) + "\n  " + "\n  ".join(tensor_strings)
+            )
+
+        def _fail(*call_args):
+            """
+            Cold failure funnel for the specialized wrapper: re-runs the
+            interpreted checker (which raises the nice non-tensor error) and
+            otherwise raises the full colored diagnostic.
+            """
+            __tracebackhide__ = True  # hide this frame in pytest reports
+            try:
+                if _check_fast(call_args, {}) is not _FAILED:
+                    # The compiled guard is allowed to be conservative (e.g. a
+                    # non-tuple .shape losing a tuple comparison); when the
+                    # interpreted checker passes, the call proceeds normally.
+                    return
+            except ShapeMismatchError as e:
+                # `from None` drops the chained AttributeError context
+                raise e from None
+            raise ShapeMismatchError(_build_error(call_args, {})) from None
+
+        # Specialization: a plain positional function (no *args/**kwargs, no
+        # keyword-only params) gets an exec-generated wrapper with the checks
+        # unrolled into straight-line code over its own parameter names.
+        # Parameters that would shadow a name the generated body relies on
+        # (the module-global ENABLED, the builtin len) keep the generic wrapper.
+        func_code = getattr(tensor_func, "__code__", None)
+        if (
+            actual_func_sig is None
+            and func_code.co_kwonlyargcount == 0
+            and not any(
+                name.startswith("_") or name in ("ENABLED", "len")
+                for name in func_code.co_varnames[:func_code.co_argcount]
+            )
+        ):
+            argnames = func_code.co_varnames[:func_code.co_argcount]
+            spec_key = tuple(sorted((spec.param_index, spec.expected) for spec in checks))
+            code_obj = _specialized_code(argnames, frozenset(param_defaults), spec_key)
+            namespace = {"_func": tensor_func, "_fail": _fail}
+            for name, value in param_defaults.items():
+                namespace[f"_default_{name}"] = value
+            exec(code_obj, globals(), namespace)
+            return functools.wraps(tensor_func)(namespace["sizes_wrapper"])
 
-            except ValueError as e:
-                # Strip this decorator's traceback so user sees their own code line
-                tb = e.__traceback__
-                while tb is not None:
-                    code_name = tb.tb_frame.f_code.co_name
-                    if code_name != 'sizes_wrapper':
-                        break
-                    tb = tb.tb_next
-                raise e.with_traceback(tb)
+        @functools.wraps(tensor_func)
+        def sizes_wrapper(*args, **kwargs):
+            if not ENABLED:
+                return tensor_func(*args, **kwargs)
+            __tracebackhide__ = True  # hide this frame in pytest reports
+            if _check_fast(args, kwargs) is _FAILED:
+                raise ShapeMismatchError(_build_error(args, kwargs)) from None
+
+            # Pass the caller's args straight through rather than
+            # re-packing them out of a BoundArguments.
+            return tensor_func(*args, **kwargs)
 
         return sizes_wrapper
 
@@ -292,7 +636,7 @@ if __name__ == "__main__":
 #                     actual_shape = tuple(actual_tensor.shape)
 #                     if len(actual_shape) != len(expected_shape):
 #                         raise ValueError(F"@sizes: Tensor {expected_tensor_name} with shape {actual_shape} cannot match {expected_shape}.")
-                    
+
 #                     collected_tensors[expected_tensor_name] = (expected_shape, actual_shape)
 
 #                 exacts_good : bool = True
@@ -312,7 +656,7 @@ if __name__ == "__main__":
 #                                 assert_never(impossible)
 
 #                 inconsistent_wildcards = {key for key, value in wildcards.items() if len(value) != 1}
-                
+
 #                 # Put together error message if shape errors exist
 #                 if not exacts_good or inconsistent_wildcards:
 #                     tensor_strings = []
@@ -343,11 +687,11 @@ if __name__ == "__main__":
 #                         error_msg = F"@sizes: Tensor dimensions were inconsistent in the Tensor(s):"
 #                     else:
 #                         error_msg = F"@sizes: Tensor dimensions and wildcards {', '.join(inconsistent_wildcards)} were inconsistent in Tensor(s):"
-                    
+
 #                     raise ValueError(error_msg + '\n  ' + ", ".join(tensor_strings))
-                
+
 #                 return tensor_func(*actual_func_bindings.args, **actual_func_bindings.kwargs)
-            
+
 #             except ValueError as e:
 #                 tb = e.__traceback__
 #                 while tb is not None:
@@ -360,4 +704,3 @@ if __name__ == "__main__":
 #         return sizes_wrapper
 
 #     return sizes_decorator
-